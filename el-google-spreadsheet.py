@@ -1,13 +1,17 @@
 # app.py
 import os
 import time
+import csv
+import hashlib
 import io
+import tempfile
+import requests
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from streamlit_autorefresh import st_autorefresh
 from datetime import datetime
 
 # ---------- Page config ----------
@@ -22,17 +26,19 @@ st.title("🗳️ Nanded Election Dashboard — All Visuals (Tabs + Expanders)")
 # ---------- Helpful defaults ----------
 # Use the uploaded file path from the session (developer note)
 DEFAULT_PATH = "/mnt/data/Nanded_Election_20251125_0726.xlsx"
+# Bump whenever _clean changes the cleaned schema, so sidecars written by older code are ignored
+CLEAN_VERSION = 1
 
 # ---------- Sidebar: Data Source + Auto-refresh ----------
 st.sidebar.header("Data source & Controls")
 
 auto_refresh = st.sidebar.checkbox("Auto-refresh every 10 seconds (live)")
 
-# If auto_refresh checked: wait then rerun at top of script loop
+# If auto_refresh checked: schedule a client-side rerun every 10s (the script thread is never blocked;
+# reruns hit the cached loaders, so a refresh only re-renders unless the source data changed)
+REFRESH_SECONDS = 10
 if auto_refresh:
-    # Pause for 10s then rerun so the app refreshes continuously
-    time.sleep(10)
-    st.experimental_rerun()
+    st_autorefresh(interval=REFRESH_SECONDS * 1000, key="poll")
 
 uploaded_file = st.sidebar.file_uploader("Upload Election Excel File (optional)", type=["xlsx"])
 
@@ -41,9 +47,110 @@ google_sheet_url = st.sidebar.text_input(
     value=""
 )
 
+# ---------- Cached loaders & cleaning (run once per file/URL, not once per rerun) ----------
+@st.cache_data(show_spinner=False, ttl=600)
+def _load_excel(source, mtime=None):
+    """Parse an Excel workbook from uploaded bytes or a file path (mtime keys the cache for paths)."""
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    return pd.read_excel(source, engine="calamine")
+
+@st.cache_resource
+def _http_session():
+    """One pooled HTTP session per server process, so repeated sheet fetches reuse the connection."""
+    session = requests.Session()
+    session.headers["Accept-Encoding"] = "gzip"
+    return session
+
+@st.cache_data(show_spinner=False, ttl=60)
+def _load_gsheet(csv_url: str, refresh_slot=None):
+    """Fetch a Google Sheet CSV export and parse it with Arrow's multithreaded CSV reader; also returns a digest of the export.
+
+    refresh_slot is only a cache key: it changes every refresh interval while auto-refresh is on.
+    """
+    resp = _http_session().get(csv_url, timeout=10)
+    resp.raise_for_status()
+    # Keep Time as text: Arrow would otherwise infer a time type and "09:00" would no longer match the slot labels.
+    # Blank cells must come back as nulls (as pd.read_csv gave NaN), not "", or they show up as a "" team/constituency
+    convert = pa_csv.ConvertOptions(column_types={"Time": pa.string()},
+                                    strings_can_be_null=True, quoted_strings_can_be_null=True)
+    df = pa_csv.read_csv(io.BytesIO(resp.content), convert_options=convert).to_pandas()
+    return df, hashlib.md5(resp.content).hexdigest()
+
+def _time_categories(times):
+    """Ordered Time categories: the standard polling slots present in the data, else the sorted unique values."""
+    # For ordering times, provide a default order if expected values present
+    time_order = ["09:00","11:00","13:00","15:00","17:00","18:00"]
+    # Keep only times found in data for the sidebar
+    found_times = [t for t in time_order if t in times]
+    if len(found_times) == 0:
+        # fallback: unique sorted times from data
+        found_times = sorted(times)
+    return found_times
+
+def _describe(df: pd.DataFrame):
+    """Dataset-invariant sidebar inputs (sorted options, slider bounds) plus a content-hash version for cache keys."""
+    return {
+        "version": hashlib.md5(pd.util.hash_pandas_object(df, index=False).values).hexdigest(),
+        "teams": sorted(df["Team Number"].dropna().unique().tolist()),
+        "consts": sorted(df["Constitution"].dropna().unique().tolist()),
+        "dates": sorted(df["Date"].dropna().dt.strftime("%Y-%m-%d").unique().tolist()),
+        "times": list(df["Time"].cat.categories),
+        "ranges": {col: (int(df[col].min()), int(df[col].max())) for col in ["Male","Female","Transgender"]},
+    }
+
+# Cleaning is cached: runs once per loaded file, not once per rerun. The frame itself is not hashed
+# (Streamlit only samples rows of large frames); source_key is the loader's exact key for the data.
+@st.cache_data(show_spinner=False, ttl=600)
+def _clean(_df: pd.DataFrame, source_key):
+    """Normalize Date/Time, coerce vote counts, derive Total and order Time as a categorical."""
+    df = _df
+    # Normalize date/time columns
+    df["Date"] = pd.to_datetime(df["Date"], errors="coerce").dt.normalize()
+    df["Time"] = df["Time"].astype(str).str.strip()
+
+    # Convert numeric columns (int32 is ample for per-record vote counts and halves the bytes scanned)
+    for col in ["Male","Female","Transgender"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype("int32")
+
+    # Dictionary-encode the grouping/filter keys so groupby and equality masks run on int codes
+    for col in ["Team Number","Constitution"]:
+        df[col] = df[col].astype("category")
+
+    # Derived columns
+    df["Total"] = df["Male"].to_numpy() + df["Female"].to_numpy() + df["Transgender"].to_numpy()
+
+    found_times = _time_categories(df["Time"].unique().tolist())
+    df["Time"] = pd.Categorical(df["Time"], categories=found_times, ordered=True)
+    return df, _describe(df)
+
+@st.cache_data(show_spinner=False, ttl=600)
+def _load_parquet(path: str, mtime: float):
+    """Read an already-cleaned Parquet sidecar; Time is stored as text and re-ordered here."""
+    df = pd.read_parquet(path)
+    found_times = _time_categories(df["Time"].dropna().unique().tolist())
+    df["Time"] = df["Time"].astype("category").cat.set_categories(found_times, ordered=True)
+    return df, _describe(df)
+
+def _write_parquet(df: pd.DataFrame, path: str):
+    """Persist the cleaned frame next to the workbook; failures just keep the xlsx path."""
+    # Not cached: it only runs when the sidecar is missing, stale or unreadable, and a successful write ends that.
+    # Written to a uniquely named temp file and swapped in, so concurrent writers and readers never see a partial file
+    tmp = None
+    try:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".parquet.tmp")
+        os.close(fd)
+        df.assign(Time=df["Time"].astype(str)).to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+        return True
+    except Exception:
+        if tmp and os.path.exists(tmp):
+            os.remove(tmp)
+        return False
+
 # ---------- Helper to load Google Sheet as CSV ----------
-def load_google_sheet_as_df(url: str):
-    """Attempt to convert a variety of Google Sheets share URLs into a CSV export URL and load as DataFrame."""
+def load_google_sheet_as_df(url: str, refresh_slot=None):
+    """Attempt to convert a variety of Google Sheets share URLs into a CSV export URL and load as (DataFrame, digest)."""
     url = url.strip()
     if not url:
         return None
@@ -84,9 +191,8 @@ def load_google_sheet_as_df(url: str):
             st.sidebar.error("Couldn't construct CSV URL for that Google Sheet.")
             return None
 
-        # Read CSV into DataFrame
-        df_gs = pd.read_csv(csv_url)
-        return df_gs
+        # Read CSV into DataFrame (cached per export URL), plus the export's digest as the cleaning key
+        return _load_gsheet(csv_url, refresh_slot)
 
     except Exception as e:
         st.sidebar.error(f"Failed to load Google Sheet: {e}")
@@ -94,22 +200,41 @@ def load_google_sheet_as_df(url: str):
 
 # ---------- Load data (priority: uploaded file > google sheet > default file) ----------
 df = None
+source_key = None
+from_sidecar = False
+write_sidecar = False
+sidecar_path = f"{DEFAULT_PATH}.v{CLEAN_VERSION}.parquet"
 if uploaded_file is not None:
     try:
-        df = pd.read_excel(uploaded_file)
+        source_key = uploaded_file.getvalue()
+        df = _load_excel(source_key)
         st.sidebar.success("Excel file uploaded ✔")
     except Exception as e:
         st.sidebar.error(f"Failed to read uploaded Excel file: {e}")
         st.stop()
 elif google_sheet_url.strip() != "":
-    df = load_google_sheet_as_df(google_sheet_url)
-    if df is not None:
+    # While live, a new slot every refresh interval forces a refetch instead of waiting out the 60 s TTL
+    refresh_slot = int(time.time() // REFRESH_SECONDS) if auto_refresh else None
+    loaded = load_google_sheet_as_df(google_sheet_url, refresh_slot)
+    if loaded is not None:
+        df, source_key = loaded
         st.sidebar.success("Google Sheet loaded ✔")
     else:
         st.stop()
 elif os.path.exists(DEFAULT_PATH):
     try:
-        df = pd.read_excel(DEFAULT_PATH)
+        # Prefer the cleaned Parquet sidecar while it is at least as new as the workbook
+        if os.path.exists(sidecar_path) and os.path.getmtime(sidecar_path) >= os.path.getmtime(DEFAULT_PATH):
+            try:
+                df, meta = _load_parquet(sidecar_path, os.path.getmtime(sidecar_path))
+                from_sidecar = True
+            except Exception:
+                # Unreadable sidecar: rebuild it from the workbook below
+                pass
+        if not from_sidecar:
+            source_key = (DEFAULT_PATH, os.path.getmtime(DEFAULT_PATH))
+            df = _load_excel(*source_key)
+            write_sidecar = True
         st.sidebar.info(f"Loaded default file: {DEFAULT_PATH}")
     except Exception as e:
         st.sidebar.error(f"Failed to load default Excel file: {e}")
@@ -119,50 +244,38 @@ else:
     st.stop()
 
 # ---------- Basic cleaning & validation ----------
-expected_cols = {"Team Number","Name","Mobile","Date","Time","Male","Female","Transgender","Constitution"}
-missing = expected_cols - set(df.columns)
-if missing:
-    st.error(f"Missing expected columns: {missing}. Please ensure file has the required columns.")
-    st.stop()
-
-# Normalize date/time columns
-df["Date"] = pd.to_datetime(df["Date"], errors="coerce").dt.date
-df["Time"] = df["Time"].astype(str).str.strip()
-
-# Convert numeric columns
-for col in ["Male","Female","Transgender"]:
-    df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype(int)
+if not from_sidecar:
+    expected_cols = {"Team Number","Name","Mobile","Date","Time","Male","Female","Transgender","Constitution"}
+    missing = expected_cols - set(df.columns)
+    if missing:
+        st.error(f"Missing expected columns: {missing}. Please ensure file has the required columns.")
+        st.stop()
 
-# Derived columns
-df["Total"] = df[["Male","Female","Transgender"]].sum(axis=1)
+    df, meta = _clean(df, source_key)
+    if write_sidecar:
+        _write_parquet(df, sidecar_path)
 
-# For ordering times, provide a default order if expected values present
-time_order = ["09:00","11:00","13:00","15:00","17:00","18:00"]
-# Keep only times found in data for the sidebar
-found_times = [t for t in time_order if t in df["Time"].unique()]
-if len(found_times) == 0:
-    # fallback: unique sorted times from data
-    found_times = sorted(df["Time"].unique().tolist())
-df["Time"] = pd.Categorical(df["Time"], categories=found_times, ordered=True)
+data_version = meta["version"]
+found_times = meta["times"]
 
 # ---------- Sidebar filters ----------
 st.sidebar.header("Filters")
 
-team_opts = ["All"] + sorted(df["Team Number"].dropna().unique().tolist())
+team_opts = ["All"] + meta["teams"]
 selected_team = st.sidebar.selectbox("Team Number", team_opts)
 
-const_opts = ["All"] + sorted(df["Constitution"].dropna().unique().tolist())
+const_opts = ["All"] + meta["consts"]
 selected_const = st.sidebar.selectbox("Constitution", const_opts)
 
-date_opts = ["All"] + sorted(df["Date"].dropna().astype(str).unique().tolist())
+date_opts = ["All"] + meta["dates"]
 selected_date = st.sidebar.selectbox("Date", date_opts)
 
 time_opts = ["All"] + found_times
 selected_time = st.sidebar.selectbox("Time", time_opts)
 
-male_min, male_max = int(df["Male"].min()), int(df["Male"].max())
-female_min, female_max = int(df["Female"].min()), int(df["Female"].max())
-trans_min, trans_max = int(df["Transgender"].min()), int(df["Transgender"].max())
+male_min, male_max = meta["ranges"]["Male"]
+female_min, female_max = meta["ranges"]["Female"]
+trans_min, trans_max = meta["ranges"]["Transgender"]
 
 male_range = st.sidebar.slider("Male range", male_min, male_max, (male_min, male_max))
 female_range = st.sidebar.slider("Female range", female_min, female_max, (female_min, female_max))
@@ -173,21 +286,21 @@ if st.sidebar.button("Reset Filters"):
     st.experimental_rerun()
 
 # ---------- Apply filters ----------
-fdf = df.copy()
+# Build one boolean mask over the raw arrays and slice once (instead of a copy per filter)
+m = np.ones(len(df), dtype=bool)
 if selected_team != "All":
-    fdf = fdf[fdf["Team Number"] == selected_team]
+    m &= (df["Team Number"].values == selected_team)
 if selected_const != "All":
-    fdf = fdf[fdf["Constitution"] == selected_const]
+    m &= (df["Constitution"].values == selected_const)
 if selected_date != "All":
-    fdf = fdf[fdf["Date"].astype(str) == selected_date]
+    m &= (df["Date"].values == np.datetime64(selected_date))
 if selected_time != "All":
-    fdf = fdf[fdf["Time"] == selected_time]
-
-fdf = fdf[
-    (fdf["Male"].between(male_range[0], male_range[1])) &
-    (fdf["Female"].between(female_range[0], female_range[1])) &
-    (fdf["Transgender"].between(trans_range[0], trans_range[1]))
-].copy()
+    m &= (df["Time"].values == selected_time)
+m &= (df["Male"].values >= male_range[0]) & (df["Male"].values <= male_range[1])
+m &= (df["Female"].values >= female_range[0]) & (df["Female"].values <= female_range[1])
+m &= (df["Transgender"].values >= trans_range[0]) & (df["Transgender"].values <= trans_range[1])
+# No copy at all when every row passes (fdf is then just df; nothing below mutates it)
+fdf = df if m.all() else df.iloc[m]
 
 # ---------- Top-line metrics ----------
 c1, c2, c3, c4 = st.columns(4)
@@ -198,6 +311,126 @@ c4.metric("Total Transgender", int(fdf["Transgender"].sum()))
 
 st.markdown("---")
 
+# ---------- Aggregations (one grouped pass per key, reused by every chart/table below) ----------
+@st.cache_resource(show_spinner=False)
+def _time_const_kernel():
+    """Fused Time x Constitution reducer, built once per server process (numba is only imported here)."""
+    from numba import njit
+
+    # Serial and nogil: concurrent sessions can each run it without numba's (non-threadsafe) parallel layer;
+    # cache=True keeps the compiled code on disk, so a new server process skips the compile
+    @njit(nogil=True, cache=True)
+    def agg_time_const(t, c, m, f, x, n_t, n_c):
+        # (n_t, n_c + 1, 4) tensor of Male/Female/Transgender sums and row counts.
+        # Rows with no Time (code -1) are skipped; rows with no Constitution go to the extra slot n_c.
+        out = np.zeros((n_t, n_c + 1, 4), np.int64)
+        for i in range(t.size):
+            ti = t[i]
+            if ti < 0:
+                continue
+            ci = c[i] if c[i] >= 0 else n_c
+            out[ti, ci, 0] += m[i]
+            out[ti, ci, 1] += f[i]
+            out[ti, ci, 2] += x[i]
+            out[ti, ci, 3] += 1
+        return out
+
+    return agg_time_const
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def compute_aggs(_fdf: pd.DataFrame, data_version: str, filter_key: tuple):
+    """Grouped frames for the Charts/Summary tabs; cached per dataset version + filter state (_fdf is not hashed)."""
+    by_const = _fdf.groupby("Constitution", observed=True)[["Male","Female","Transgender"]].sum()
+    by_const["Total"] = by_const.sum(axis=1)
+
+    # Time x Constitution (and per-Time) sums from one pass of the numba kernel over the category codes
+    time_dtype, const_dtype = _fdf["Time"].dtype, _fdf["Constitution"].dtype
+    tc = _time_const_kernel()(
+        _fdf["Time"].cat.codes.to_numpy(np.int32), _fdf["Constitution"].cat.codes.to_numpy(np.int32),
+        _fdf["Male"].to_numpy(np.int32), _fdf["Female"].to_numpy(np.int32), _fdf["Transgender"].to_numpy(np.int32),
+        len(time_dtype.categories), len(const_dtype.categories),
+    )
+    seen_t = np.flatnonzero(tc[:, :, 3].sum(axis=1))
+    by_time = pd.DataFrame(tc[seen_t, :, :3].sum(axis=1), columns=["Male","Female","Transgender"],
+                           index=pd.CategoricalIndex(pd.Categorical.from_codes(seen_t, dtype=time_dtype), name="Time"))
+    ti, ci = np.nonzero(tc[:, :-1, 3])
+    by_time_const = pd.DataFrame(tc[ti, ci, :3], columns=["Male","Female","Transgender"],
+                                 index=pd.MultiIndex.from_arrays([pd.Categorical.from_codes(ti, dtype=time_dtype),
+                                                                  pd.Categorical.from_codes(ci, dtype=const_dtype)],
+                                                                 names=["Time","Constitution"]))
+    by_time_const["Total"] = by_time_const.sum(axis=1)
+
+    by_team = _fdf.groupby("Team Number", observed=True)[["Male","Female","Transgender","Total"]].sum()
+    # Constitution x Time grid of totals (heatmap, 5PM->6PM growth)
+    heat = by_time_const["Total"].unstack("Time", fill_value=0)
+    heat.columns = heat.columns.astype(str)
+
+    # 5 PM vs 6 PM growth per constituency, read straight off the Time columns of the grid. Rows are only
+    # the constituencies with a 17:00 or 18:00 entry (the T_17/T_18 union); a slot missing for one of them is int 0
+    tc_idx = by_time_const.index
+    growth_consts = tc_idx.get_level_values("Constitution")[tc_idx.get_level_values("Time").isin(["17:00","18:00"])].unique()
+    growth = heat.reindex(index=growth_consts, columns=["17:00","18:00"], fill_value=0).set_axis(["T_17","T_18"], axis=1)
+    growth["Growth"] = growth["T_18"].to_numpy() - growth["T_17"].to_numpy()
+    growth = growth.sort_values("Growth", ascending=False)
+
+    # Histogram bins computed here, so the browser gets 20 bars rather than every row
+    counts, edges = np.histogram(_fdf["Total"].to_numpy(), bins=20)
+
+    return {
+        "gender_totals": _fdf[["Male","Female","Transgender"]].sum(),
+        "by_const": by_const,
+        "by_time": by_time,
+        "by_time_const": by_time_const,
+        "by_team": by_team,
+        "heat": heat,
+        "growth": growth,
+        "top5": by_const.nlargest(5, "Total"),
+        "hist": pd.DataFrame({"count": counts}, index=edges[:-1]),
+        "team_scatter": by_team[["Male","Female","Total"]].reset_index(),
+    }
+
+filter_key = (selected_team, selected_const, selected_date, selected_time, male_range, female_range, trans_range)
+aggs = compute_aggs(fdf, data_version, filter_key)
+by_const, by_time, by_time_const, by_team = aggs["by_const"], aggs["by_time"], aggs["by_time_const"], aggs["by_team"]
+heat = aggs["heat"]
+
+# ---------- Figures (rebuilt only when the data version or filters change) ----------
+def build_all_figs(aggs: dict, fdf: pd.DataFrame):
+    """Construct every Charts-tab Plotly figure from the cached aggregations (raw fdf only for the boxplots)."""
+    # Imported here rather than at the top, so the first paint of the page doesn't wait on the plotting stack
+    import plotly.express as px
+
+    figs = {}
+    gender_totals = aggs["gender_totals"]
+    figs["pie"] = px.pie(names=gender_totals.index, values=gender_totals.values,
+                         title="Gender Share (Filtered)", hole=0.35)
+
+    try:
+        radar_df = aggs["top5"].reset_index().melt(id_vars="Constitution", value_vars=["Male","Female","Transgender"], var_name="Category", value_name="Count")
+        figs["radar"] = px.line_polar(radar_df, r="Count", theta="Category", color="Constitution", line_close=True, title="Top 5 Constituency Profile (Radar)")
+    except Exception:
+        figs["radar"] = None
+
+    figs["bubble"] = px.scatter(aggs["by_const"].reset_index(), x="Constitution", y="Total", size="Total", color="Total",
+                                title="Constituency Bubble Chart (size = total votes)", hover_name="Constitution",
+                                render_mode="webgl")
+
+    heat = aggs["heat"]
+    if not heat.empty:
+        # Per-cell labels only while the grid is small enough to read (and cheap to lay out)
+        figs["heat"] = px.imshow(heat, text_auto="d" if heat.size <= 200 else False, color_continuous_scale="YlOrRd", aspect="auto",
+                                 labels=dict(x="Time", y="", color="Total"), height=max(400, 30*len(heat)))
+
+    figs["growth"] = px.bar(aggs["growth"].reset_index(), x="Constitution", y=["T_17","T_18"], title="Comparison: 5 PM vs 6 PM (per Constituency)")
+    figs["scatter"] = px.scatter(aggs["team_scatter"], x="Male", y="Female", size="Total", color="Total", hover_name="Team Number", title="Male vs Female (Team level)", render_mode="webgl")
+
+    box_df = fdf.melt(value_vars=["Male","Female","Transgender"], var_name="Gender", value_name="Count")
+    figs["box"] = px.box(box_df, x="Gender", y="Count")
+    return figs
+
+# Date stays datetime64 (fast masking) but is shown as a plain date wherever raw rows are displayed
+date_column_config = {"Date": st.column_config.DateColumn("Date", format="YYYY-MM-DD")}
+
 # ---------- Tabs ----------
 tab_records, tab_charts, tab_summary, tab_download = st.tabs([
     "📄 Records", "📊 Charts", "🧮 Team & Constituency Summary", "⬇ Download"
@@ -206,92 +439,81 @@ tab_records, tab_charts, tab_summary, tab_download = st.tabs([
 # ---------- TAB: Records ----------
 with tab_records:
     st.subheader("Filtered Records")
-    st.dataframe(fdf.reset_index(drop=True), use_container_width=True)
+    st.dataframe(fdf.reset_index(drop=True), use_container_width=True, column_config=date_column_config)
 
 # ---------- TAB: Charts ----------
 with tab_charts:
     st.subheader("Comprehensive Visualizations")
 
+    # Built here, after the sidebar and Records tab have been sent, and only when the data/filter state changes
+    figs_key = (data_version, filter_key)
+    if st.session_state.get("figs_key") != figs_key:
+        st.session_state.figs = build_all_figs(aggs, fdf)
+        st.session_state.figs_key = figs_key
+    figs = st.session_state.figs
+
     # Expander A: Gender Overview
     with st.expander("A. Gender Overview (Bar / Pie / Area)"):
-        gender_totals = fdf[["Male","Female","Transgender"]].sum()
+        gender_totals = aggs["gender_totals"]
         st.write("### Totals by Gender")
         st.bar_chart(pd.DataFrame(gender_totals).T)
 
-        fig_pie = px.pie(names=gender_totals.index, values=gender_totals.values,
-                         title="Gender Share (Filtered)", hole=0.35)
-        st.plotly_chart(fig_pie, use_container_width=True)
+        st.plotly_chart(figs["pie"], use_container_width=True)
 
         if fdf["Time"].notna().any():
-            area_df = fdf.groupby("Time")[["Male","Female","Transgender"]].sum().sort_index()
+            area_df = by_time
             st.write("### Cumulative area chart over time (Filtered)")
             st.area_chart(area_df)
 
     # Expander B: Constitution & Team Comparisons
     with st.expander("B. Constitution & Team Comparisons (Bar / Stacked / Radar / Bubble)"):
         st.write("### Constitution-wise (Stacked by Gender)")
-        const_stack = fdf.groupby("Constitution")[["Male","Female","Transgender"]].sum()
+        const_stack = by_const[["Male","Female","Transgender"]]
         st.bar_chart(const_stack)
 
-        top5 = const_stack.assign(Total=lambda x: x.sum(axis=1)).sort_values("Total", ascending=False).head(5)
+        top5 = aggs["top5"]
         st.write("### Top 5 Constituencies by Total Votes")
         st.dataframe(top5)
 
-        try:
-            radar_df = top5.reset_index().melt(id_vars="Constitution", value_vars=["Male","Female","Transgender"], var_name="Category", value_name="Count")
-            fig_rad = px.line_polar(radar_df, r="Count", theta="Category", color="Constitution", line_close=True, title="Top 5 Constituency Profile (Radar)")
-            st.plotly_chart(fig_rad, use_container_width=True)
-        except Exception:
+        if figs["radar"] is not None:
+            st.plotly_chart(figs["radar"], use_container_width=True)
+        else:
             st.info("Radar chart not available.")
 
-        bubble_df = const_stack.assign(Total=lambda x: x.sum(axis=1)).reset_index()
-        fig_bub = px.scatter(bubble_df, x="Constitution", y="Total", size="Total", color="Total",
-                             title="Constituency Bubble Chart (size = total votes)", hover_name="Constitution")
-        st.plotly_chart(fig_bub, use_container_width=True)
+        st.plotly_chart(figs["bubble"], use_container_width=True)
 
     # Expander C: Time-based Trends
     with st.expander("C. Time-based Trends (Line / Heatmap / Stacked)"):
         st.write("### Time progression per Constituency (Male / Female / Transgender)")
-        time_const = fdf.groupby(["Time","Constitution"])[["Male","Female","Transgender"]].sum().reset_index()
+        time_const = by_time_const.reset_index()
         if not time_const.empty:
-            sel_const_for_line = st.selectbox("Pick a constituency to see its time trend (or 'All')", ["All"] + sorted(df["Constitution"].unique().tolist()))
+            sel_const_for_line = st.selectbox("Pick a constituency to see its time trend (or 'All')", ["All"] + meta["consts"])
             if sel_const_for_line != "All":
                 tdf = time_const[time_const["Constitution"] == sel_const_for_line].set_index("Time").sort_index()
                 st.line_chart(tdf[["Male","Female","Transgender"]])
             else:
-                agg_time = time_const.groupby("Time")[["Male","Female","Transgender"]].sum().sort_index()
+                agg_time = by_time
                 st.line_chart(agg_time)
 
         st.write("### Heatmap: Constitution × Time (Total votes)")
-        heat = fdf.groupby(["Constitution","Time"])["Total"].sum().unstack(fill_value=0)
         if not heat.empty:
-            fig, ax = plt.subplots(figsize=(10, max(4, len(heat)*0.4)))
-            sns.heatmap(heat, annot=True, fmt="d", linewidths=.5, cmap="YlOrRd", ax=ax)
-            plt.ylabel("")
-            st.pyplot(fig)
+            st.plotly_chart(figs["heat"], use_container_width=True)
 
         st.write("### Stacked bar: Time-wise totals (district)")
-        time_stack = fdf.groupby("Time")[["Male","Female","Transgender"]].sum().sort_index()
+        time_stack = by_time
         st.bar_chart(time_stack)
 
     # Expander D: Advanced & Comparative
     with st.expander("D. Advanced & Comparative Charts (5PM→6PM Growth, Scatter, Top Teams)"):
         st.write("### 5 PM → 6 PM Growth (per Constituency)")
-        t5 = fdf[fdf["Time"] == "17:00"].groupby("Constitution")["Total"].sum()
-        t6 = fdf[fdf["Time"] == "18:00"].groupby("Constitution")["Total"].sum()
-        growth = pd.concat([t5, t6], axis=1).fillna(0)
-        growth.columns = ["T_17", "T_18"]
-        growth["Growth"] = growth["T_18"] - growth["T_17"]
-        growth = growth.sort_values("Growth", ascending=False)
+        growth = aggs["growth"]
         st.dataframe(growth)
 
-        fig_growth = px.bar(growth.reset_index(), x="Constitution", y=["T_17","T_18"], title="Comparison: 5 PM vs 6 PM (per Constituency)")
-        st.plotly_chart(fig_growth, use_container_width=True)
+        st.plotly_chart(figs["growth"], use_container_width=True)
 
         st.write("### Scatter: Male vs Female (Team-level)")
-        team_scatter = fdf.groupby("Team Number")[["Male","Female","Total"]].sum().reset_index()
-        fig_sc = px.scatter(team_scatter, x="Male", y="Female", size="Total", color="Total", hover_name="Team Number", title="Male vs Female (Team level)")
-        st.plotly_chart(fig_sc, use_container_width=True)
+        team_scatter = aggs["team_scatter"]
+        st.plotly_chart(figs["scatter"], use_container_width=True)
 
         st.write("### Top Teams by Total Votes")
         top_teams = team_scatter.sort_values("Total", ascending=False).head(10)
@@ -300,52 +522,85 @@ with tab_charts:
     # Expander E: Distribution & Outliers
     with st.expander("E. Distribution & Outliers (Boxplots, Histograms)"):
         st.write("### Boxplots")
-        fig_box, ax = plt.subplots(1,3, figsize=(15,4))
-        sns.boxplot(y=fdf["Male"], ax=ax[0]); ax[0].set_title("Male")
-        sns.boxplot(y=fdf["Female"], ax=ax[1]); ax[1].set_title("Female")
-        sns.boxplot(y=fdf["Transgender"], ax=ax[2]); ax[2].set_title("Transgender")
-        st.pyplot(fig_box)
+        st.plotly_chart(figs["box"], use_container_width=True)
 
         st.write("### Histograms")
-        fig_hist, ax = plt.subplots(figsize=(10,4))
-        ax.hist(fdf["Total"], bins=20)
-        ax.set_title("Total Votes Distribution")
-        st.pyplot(fig_hist)
+        st.caption("Total Votes Distribution")
+        st.bar_chart(aggs["hist"])
 
 # ---------- TAB: Team & Constituency Summary ----------
 with tab_summary:
     st.subheader("Aggregated Summaries")
     st.write("### Constitution Summary")
-    csum = fdf.groupby("Constitution")[["Male","Female","Transgender","Total"]].sum().sort_values("Total", ascending=False)
+    csum = by_const.sort_values("Total", ascending=False)
     st.dataframe(csum, use_container_width=True)
 
     st.write("### Team Summary")
-    tsum = fdf.groupby("Team Number")[["Male","Female","Transgender","Total"]].sum().sort_values("Total", ascending=False)
+    tsum = by_team.sort_values("Total", ascending=False)
     st.dataframe(tsum, use_container_width=True)
 
     st.write("### Drill-down: Select a Constituency to see time-series")
     sel_const_drill = st.selectbox("Drill constituency", ["All"] + list(csum.index))
     if sel_const_drill != "All":
-        drill_df = fdf[fdf["Constitution"] == sel_const_drill].groupby("Time")[["Male","Female","Transgender"]].sum().sort_index()
-        st.line_chart(drill_df)
+        # by_time_const drops rows with no Time slot, so a constituency can be in csum but missing here
+        if sel_const_drill in by_time_const.index.get_level_values("Constitution"):
+            drill_df = by_time_const.xs(sel_const_drill, level="Constitution")[["Male","Female","Transgender"]]
+            st.line_chart(drill_df)
+        else:
+            st.info("No time-slot data for this constituency in the current filter.")
+
+# ---------- Export helpers (bytes cached per dataset version + filter state) ----------
+@st.cache_data(show_spinner=False, max_entries=16)
+def _to_excel_bytes(_fdf: pd.DataFrame, data_version: str, filter_key: tuple):
+    """Serialize the filtered rows to xlsx with xlsxwriter (_fdf is not hashed; the key args identify it)."""
+    with io.BytesIO() as buffer:
+        with pd.ExcelWriter(buffer, engine="xlsxwriter", date_format="YYYY-MM-DD", datetime_format="YYYY-MM-DD") as writer:
+            _fdf.to_excel(writer, index=False, sheet_name="FilteredData")
+        return buffer.getvalue()
+
+def _csv_plain_type(t: pa.DataType) -> bool:
+    """True for Arrow types whose CSV text is identical to what pandas writes (ints, strings, dates)."""
+    if pa.types.is_dictionary(t):
+        t = t.value_type
+    return pa.types.is_integer(t) or pa.types.is_string(t) or pa.types.is_large_string(t) or pa.types.is_date32(t)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _to_csv_bytes(_fdf: pd.DataFrame, data_version: str, filter_key: tuple):
+    """Serialize the filtered rows to CSV with Arrow's native writer, falling back to pandas for unconvertible columns."""
+    try:
+        table = pa.Table.from_pandas(_fdf, preserve_index=False)
+        # Dates are normalized to midnight; write them as plain dates, as pandas does
+        date_idx = table.schema.get_field_index("Date")
+        table = table.set_column(date_idx, "Date", table.column("Date").cast(pa.date32()))
+        # Floats, bools and timestamps render differently from pandas; keep those on the pandas writer
+        if not all(_csv_plain_type(t) for t in table.schema.types):
+            return _fdf.to_csv(index=False).encode("utf-8")
+        with io.BytesIO() as buffer:
+            # Header through csv (minimal quoting, like pandas) and an unquoted body, so the bytes match to_csv;
+            # a value that would need quoting makes Arrow raise, and that file goes to pandas below
+            header = io.StringIO()
+            csv.writer(header, lineterminator="\n").writerow(table.column_names)
+            buffer.write(header.getvalue().encode("utf-8"))
+            pa_csv.write_csv(table, buffer, pa_csv.WriteOptions(include_header=False, quoting_style="none"))
+            return buffer.getvalue()
+    except pa.ArrowException:
+        return _fdf.to_csv(index=False).encode("utf-8")
 
 # ---------- TAB: Download ----------
 with tab_download:
     st.subheader("Download filtered data")
-    csv = fdf.to_csv(index=False).encode("utf-8")
-    st.download_button("Download CSV", data=csv, file_name="filtered_election_data.csv", mime="text/csv")
+    csv_bytes = _to_csv_bytes(fdf, data_version, filter_key)
+    st.download_button("Download CSV", data=csv_bytes, file_name="filtered_election_data.csv", mime="text/csv")
 
     # Excel download
     try:
-        with io.BytesIO() as buffer:
-            with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
-                fdf.to_excel(writer, index=False, sheet_name="FilteredData")
-            st.download_button("Download Excel", data=buffer.getvalue(), file_name="filtered_election_data.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+        xlsx = _to_excel_bytes(fdf, data_version, filter_key)
+        st.download_button("Download Excel", data=xlsx, file_name="filtered_election_data.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
     except Exception as e:
         st.warning(f"Excel download not available: {e}")
 
     st.write("Preview of filtered data:")
-    st.dataframe(fdf.head(), use_container_width=True)
+    st.dataframe(fdf.head(), use_container_width=True, column_config=date_column_config)
 
 # ---------- Footer ----------
 st.markdown("---")